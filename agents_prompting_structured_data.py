@@ -5,16 +5,69 @@ One of the most powerful aspects of this tool-based approach is how it enables h
 
 The first tool, extract_invoice_data, acts as our intelligent document analyzer. This function uses self-prompting to take raw document text and transform it into structured data following a consistent schema. It uses a prompt that guides the LLM to identify crucial invoice elements like invoice numbers, dates, and line items. By enforcing a fixed JSON schema with required fields, the tool ensures data consistency regardless of the original invoice format. It is still possible that the LLM may hallucinate, so other techniques could be needed for a production use case, but this demonstrates the basic functionality.
 
-The second tool, store_invoice, provides a simple persistence mechanism in a dictionary. Once an invoice has been properly extracted and structured, this function saves it to our invoice database, using the invoice number as a unique identifier. The invoices are stored separate from the memory so that they can be persisted across runs of the agent.
+The second tool, store_invoice, provides a simple persistence mechanism in a SQLite table. Once an invoice has been properly extracted and structured, this function saves it to our invoice database, using the invoice number as a unique identifier. The invoices are stored separate from the memory so that they can be persisted across runs of the agent.
 
 This implementation provides several key benefits:
 - Consistent Data Structure: The fixed schema in extract_invoice_data ensures all invoices are processed into a consistent format. The prompting / logic for how to extract invoice data is separate from the agent’s core reasoning, making it easier to modify and maintain.
 - Modular Design: Each tool has a single, clear responsibility, making the system easy to maintain and extend. Details for how the tools are implemented are hidden from the overall Goals of the agent.
 - Error Handling: Built-in validation ensures required fields are present and data is properly formatted.
-- Persistent Storage: The simple dictionary-based storage can be easily replaced with a database or other persistence mechanism by modifying the storage tools. The work that the agent does can now be persisted across runs.
+- Persistent Storage: The simple SQLite-based storage can be easily replaced with another database or persistence mechanism by modifying the storage tools. The work that the agent does can now be persisted across runs.
 
 """
 
+import asyncio
+import concurrent.futures
+import sqlite3
+import threading
+
+import msgspec
+
+from invoice_focus import focus_invoice_region
+from invoice_models import INVOICE_SCHEMA, Invoice
+
+def _decode_invoice(response: str) -> dict:
+    """
+    Parse and validate the LLM's raw JSON into an Invoice in one native pass, returning plain builtins.
+    """
+    return msgspec.to_builtins(msgspec.json.decode(response, type=Invoice))
+
+# Invoices live in SQLite so they persist across runs of the agent. The database is opened on
+# first use, so importing this module doesn't create a file.
+_invoice_db = None
+# Guards the invoice connection and its lazy creation so concurrent store_invoice calls take turns
+_invoice_db_lock = threading.Lock()
+
+def _get_invoice_db() -> sqlite3.Connection:
+    """
+    Open the invoice database on first use. WAL lets concurrent agents keep reading while
+    another one writes. Callers must hold _invoice_db_lock.
+    """
+    global _invoice_db
+    if _invoice_db is None:
+        _invoice_db = sqlite3.connect("invoices.db", check_same_thread=False)
+        _invoice_db.execute("PRAGMA journal_mode=WAL")
+        _invoice_db.execute(
+            "CREATE TABLE IF NOT EXISTS invoices(invoice_number TEXT PRIMARY KEY, data TEXT) WITHOUT ROWID"
+        )
+    return _invoice_db
+
+# A focused prompt for invoice extraction
+_EXTRACTION_PROMPT_TEMPLATE = """
+            You are an expert invoice analyzer. Extract invoice information accurately and 
+            thoroughly. Pay special attention to:
+            - Invoice numbers (look for 'Invoice #', 'No.', 'Reference', etc.)
+            - Dates (focus on invoice date or issue date, written as YYYY-MM-DD)
+            - Amounts (ensure you capture the total amount and its currency correctly)
+            - Vendor information (company name, tax ID if present, address)
+            - Line items (capture all individual charges)
+            
+            Extract the invoice data from:
+            
+            <invoice>
+            {document_text}
+            </invoice>
+    """
+
 @register_tool(tags=["document_processing", "invoices"])
 def extract_invoice_data(action_context: ActionContext, document_text: str) -> dict:
     """
@@ -30,58 +83,83 @@ def extract_invoice_data(action_context: ActionContext, document_text: str) -> d
     Returns:
         A dictionary containing the extracted invoice data in a standardized format
     """
-    invoice_schema = {
-        "type": "object",
-        "required": ["invoice_number", "date", "total_amount"],
-        "properties": {
-            "invoice_number": {"type": "string"},
-            "date": {"type": "string"},
-            "total_amount": {"type": "number"},
-            "vendor": {
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string"},
-                    "address": {"type": "string"}
-                }
-            },
-            "line_items": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "description": {"type": "string"},
-                        "quantity": {"type": "number"},
-                        "unit_price": {"type": "number"},
-                        "total": {"type": "number"}
-                    }
-                }
-            }
-        }
-    }
+    # Fill in a focused prompt for invoice extraction
+    extraction_prompt = _EXTRACTION_PROMPT_TEMPLATE.format(
+        document_text=focus_invoice_region(document_text)
+    )
 
-    # Create a focused prompt for invoice extraction
-    extraction_prompt = f"""
-            You are an expert invoice analyzer. Extract invoice information accurately and 
-            thoroughly. Pay special attention to:
-            - Invoice numbers (look for 'Invoice #', 'No.', 'Reference', etc.)
-            - Dates (focus on invoice date or issue date)
-            - Amounts (ensure you capture the total amount correctly)
-            - Line items (capture all individual charges)
-            
-            Stop and think step by step. Then, extract the invoice data from:
-            
-            <invoice>
-            {document_text}
-            </invoice>
+    # Use our specialized prompt, validating each response against the Invoice Struct so a
+    # mismatch is retried and never cached
+    try:
+        return prompt_llm_for_decoded_json(
+            action_context=action_context,
+            schema=INVOICE_SCHEMA,
+            prompt=extraction_prompt,
+            decode=_decode_invoice
+        )
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Extracted invoice data does not match the schema: {e}") from e
+
+def _extract_invoices_concurrently(action_context: ActionContext, document_texts: list[str],
+                                   concurrency: int) -> list[dict | Exception]:
+    """
+    Run extract_invoice_data over every document on a pool of `concurrency` threads. Each
+    document gets either its extracted invoice data or the exception it raised, so one bad
+    invoice doesn't discard the rest of the batch.
     """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(extract_invoice_data, action_context, document_text)
+            for document_text in document_texts
+        ]
 
-    # Use prompt_llm_for_json with our specialized prompt
-    return prompt_llm_for_json(
-        action_context=action_context,
-        schema=invoice_schema,
-        prompt=extraction_prompt
+    results = []
+    for future in futures:
+        error = future.exception()
+        results.append(error if error is not None else future.result())
+    return results
+
+async def extract_invoice_data_many(action_context: ActionContext, document_texts: list[str], *,
+                                    concurrency: int = 16) -> list[dict | Exception]:
+    """
+    Extract invoice data from many documents concurrently from async code, with at most
+    `concurrency` LLM requests in flight. Match this to the number of requests the LLM server
+    can batch together. The work runs on a thread pool, so the event loop stays free.
+
+    Args:
+        document_texts: The text content of each invoice to process
+        concurrency: Maximum number of extractions running at once
+
+    Returns:
+        For each document, in order, either its extracted invoice data or the exception raised
+        while extracting it
+    """
+    return await asyncio.to_thread(
+        _extract_invoices_concurrently, action_context, document_texts, concurrency
     )
 
+@register_tool(tags=["document_processing", "invoices"])
+def extract_invoice_data_batch(action_context: ActionContext, document_texts: list[str]) -> list[dict]:
+    """
+    Extract standardized invoice data from several documents at once.
+
+    The extractions are sent to the LLM concurrently rather than one round-trip per invoice,
+    so a server with continuous batching (like vLLM) can process them together. Every prompt
+    shares the same schema and instructions, which also lets prefix caching kick in.
+
+    Args:
+        document_texts: The text content of each invoice to process
+
+    Returns:
+        A list with one entry per document, in the same order as document_texts: the extracted
+        invoice data, or an error status and message if that document couldn't be extracted
+    """
+    results = _extract_invoices_concurrently(action_context, document_texts, concurrency=16)
+    return [
+        {"status": "error", "message": str(result)} if isinstance(result, Exception) else result
+        for result in results
+    ]
+
 @register_tool(tags=["storage", "invoices"])
 def store_invoice(action_context: ActionContext, invoice_data: dict) -> dict:
     """
@@ -94,19 +172,28 @@ def store_invoice(action_context: ActionContext, invoice_data: dict) -> dict:
     Returns:
         A dictionary containing the storage result and invoice number
     """
-    # Get our invoice storage from context
-    storage = action_context.get("invoice_storage", {})
-    
     # Extract invoice number for reference
     invoice_number = invoice_data.get("invoice_number")
     if not invoice_number:
         raise ValueError("Invoice data must contain an invoice number")
+
+    # Store a typed record rather than whatever nested dict we were handed
+    try:
+        invoice = msgspec.convert(invoice_data, type=Invoice)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Invoice data does not match the schema: {e}") from e
     
-    # Store the invoice
-    storage[invoice_number] = invoice_data
+    # Store the invoice, replacing any previous version with the same number
+    with _invoice_db_lock:
+        invoice_db = _get_invoice_db()
+        with invoice_db:
+            invoice_db.execute(
+                "INSERT OR REPLACE INTO invoices VALUES (?, ?)",
+                (invoice_number, msgspec.json.encode(invoice).decode())
+            )
     
     return {
         "status": "success",
         "message": f"Stored invoice {invoice_number}",
         "invoice_number": invoice_number
-    }
\ No newline at end of file
+    }
@@ -22,6 +22,79 @@ Use the general-purpose approach when:
 
 """
 
+import functools
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+import jsonschema
+import orjson
+
+from llm_json import extract_json_block
+
+# Bump whenever the system prompt or response handling below changes so stale cache entries are ignored
+PROMPT_VERSION = "5"
+
+# How long a cached LLM response stays valid
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Responses are cached across runs so reprocessing the same document doesn't pay for another LLM call.
+# The cache is keyed on the "llm_model" context property; without it, nothing is cached and the
+# database is never opened.
+_llm_cache = None
+# Guards the cache connection and its lazy creation; prompt_llm_for_json may run on several threads at once
+_llm_cache_lock = threading.Lock()
+
+def _get_llm_cache() -> sqlite3.Connection:
+    """
+    Open the LLM response cache on first use. Callers must hold _llm_cache_lock.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = sqlite3.connect("llm_cache.db", check_same_thread=False)
+        _llm_cache.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache(key TEXT PRIMARY KEY, response TEXT, expires_at REAL)"
+        )
+    return _llm_cache
+
+def _llm_cache_key(model_id: str, prompt: str, schema: dict) -> str:
+    """
+    Hash everything that influences the LLM response into a single cache key. The fields are
+    encoded as a JSON array so no two different requests can produce the same bytes.
+    """
+    payload = orjson.dumps([model_id, PROMPT_VERSION, prompt, schema], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+@functools.lru_cache(maxsize=128)
+def _schema_validator(schema_json: bytes):
+    """
+    Build (and remember) a validator for a schema. jsonschema.validate() looks up the validator
+    class and re-checks the schema on every call, so we only pay for that once per schema.
+    Formats such as "date" are enforced too; jsonschema only annotates them by default.
+
+    This is the validator for the generic prompt_llm_for_json tool. Tools with a typed model
+    pass their own decode to prompt_llm_for_decoded_json instead, so nothing is validated twice.
+    """
+    schema = orjson.loads(schema_json)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema, format_checker=jsonschema.FormatChecker())
+
+def _json_schema_response_format(schema: dict) -> dict:
+    """
+    Build an OpenAI-style structured output response_format for a JSON schema. vLLM's
+    OpenAI-compatible server accepts the same payload and turns it into guided decoding.
+
+    We leave "strict" off because strict mode requires every property to be required,
+    which our schemas don't do; vLLM enforces the schema either way.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "response", "schema": schema}
+    }
+
 @register_tool()
 def prompt_llm_for_json(action_context: ActionContext, schema: dict, prompt: str):
     """
@@ -35,27 +108,73 @@ def prompt_llm_for_json(action_context: ActionContext, schema: dict, prompt: str
     Returns:
         A dictionary matching the provided schema with extracted information
     """
+    validator = _schema_validator(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
+
+    def decode(response: str) -> dict:
+        result = orjson.loads(response)
+        validator.validate(result)
+        return result
+
+    return prompt_llm_for_decoded_json(action_context, schema, prompt, decode)
+
+def prompt_llm_for_decoded_json(action_context: ActionContext, schema: dict, prompt: str,
+                                decode: Callable[[str], dict]) -> dict:
+    """
+    Have the LLM generate JSON for a schema, using `decode` to parse and validate the raw JSON text.
+    Tools with a typed model for their schema use this directly so their own validation is the
+    one that decides whether a response is retried and cached.
+
+    Args:
+        schema: JSON schema defining the expected structure
+        prompt: The prompt to send to the LLM
+        decode: Turns the raw JSON text into the result, raising if it doesn't fit the schema
+
+    Returns:
+        The decoded result for the first response that passes `decode`
+    """
     generate_response = action_context.get("llm")
-    
+
+    # Skip the LLM entirely if we've already answered this exact request. Responses are only
+    # cached when the context names the model, so switching models never serves stale answers.
+    model_id = action_context.get("llm_model")
+    cache_key = None
+    cached = None
+    if model_id:
+        cache_key = _llm_cache_key(model_id, prompt, schema)
+        with _llm_cache_lock:
+            cached = _get_llm_cache().execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (cache_key, time.time())
+            ).fetchone()
+    if cached:
+        try:
+            return decode(cached[0])
+        except Exception as e:
+            # Cached by a caller with looser validation; ask the LLM again
+            print(f"Ignoring cached response: {e}")
+
     # Try up to 3 times to get valid JSON
     for i in range(3):
         try:
-            # Send prompt with schema instruction and get response
-            response = generate_response(Prompt(messages=[
-                {"role": "system", 
-                 "content": f"You MUST produce output that adheres to the following JSON schema:\n\n{json.dumps(schema, indent=4)}. Output your JSON in a ```json markdown block."},
-                {"role": "user", "content": prompt}
-            ]))
-
-            # Check if the response has json inside of a markdown code block
-            if "```json" in response:
-                # Search from the front and then the back
-                start = response.find("```json")
-                end = response.rfind("```")
-                response = response[start+7:end].strip()
-
-            # Parse and validate the JSON response
-            return json.loads(response)
+            # Send prompt with schema instruction and get response. The schema is also passed as
+            # a structured output response_format so backends that support constrained decoding
+            # (OpenAI json_schema, vLLM guided decoding) can only sample tokens that keep the
+            # output valid, rather than us finding out after the fact and retrying.
+            response = generate_response(Prompt(
+                messages=[
+                    {"role": "system",
+                     "content": f"You MUST produce output that adheres to the following JSON schema:\n\n{orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()}. Output only the JSON object, with no markdown or commentary."},
+                    {"role": "user", "content": prompt}
+                ],
+                metadata={"response_format": _json_schema_response_format(schema)}
+            ))
+
+            # The JSON may be inside of a markdown code block or surrounded by commentary
+            response = extract_json_block(response)
+
+            # Parse and validate the JSON response before it's cached, so a bad response is retried
+            result = decode(response)
+            break
             
         except Exception as e:
             if i == 2:  # On last try, raise the error
@@ -63,6 +182,18 @@ def prompt_llm_for_json(action_context: ActionContext, schema: dict, prompt: str
             print(f"Error generating response: {e}")
             print("Retrying...")
 
+    if cache_key:
+        now = time.time()
+        with _llm_cache_lock:
+            llm_cache = _get_llm_cache()
+            with llm_cache:
+                llm_cache.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                llm_cache.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)",
+                    (cache_key, response, now + LLM_CACHE_TTL_SECONDS)
+                )
+    return result
+
 invoice_schema = {
     "type": "object",
     "properties": {
@@ -0,0 +1,30 @@
+"""
+Analytics helpers for extracted invoices. Line items are converted to columnar NumPy arrays so
+aggregations over many invoices run as vectorized operations instead of Python loops. This
+lives apart from the agent tools so NumPy is only imported by code that does analytics.
+"""
+
+import numpy as np
+
+def to_arrays(invoice_data: dict) -> dict[str, np.ndarray]:
+    """
+    Convert an invoice's line items into one NumPy array per column, so totals and quantities
+    can be aggregated with vectorized operations instead of looping over a dict per row.
+    Missing values become NaN. For analytics across many invoices, np.concatenate the
+    per-invoice arrays into one contiguous array first.
+
+    Args:
+        invoice_data: Extracted or stored invoice data
+
+    Returns:
+        A dictionary mapping "quantity", "unit_price", and "total" to float64 arrays
+    """
+    line_items = invoice_data.get("line_items", [])
+    return {
+        column: np.fromiter(
+            (np.nan if item.get(column) is None else item[column] for item in line_items),
+            dtype=np.float64,
+            count=len(line_items)
+        )
+        for column in ("quantity", "unit_price", "total")
+    }
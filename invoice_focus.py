@@ -0,0 +1,50 @@
+"""
+Preprocessing for invoice documents before they are sent to the LLM. LLM latency grows with the
+number of input tokens, so long documents are trimmed to the region that holds the invoice,
+dropping cover letters before it and terms and conditions after it.
+"""
+
+import re
+
+# Lines that look like invoice content: numbers, references, parties, totals, dates, and currency amounts
+_INVOICE_LINE_PATTERN = re.compile(
+    r"invoice|\binv\b|reference|\bno\.|#"
+    r"|\b(?:bill|ship|sold|remit)\s+to\b"
+    r"|\b(?:sub)?total\b|\bamount\b|\bbalance\b|\bdue\b|\btax\b|\bvat\b"
+    r"|\b\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}\b"
+    r"|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b"
+    r"|[$€£¥]\s?\d|\d\.\d{2}\b",
+    re.IGNORECASE
+)
+# Documents this short are sent as-is; there's nothing worth trimming
+_FOCUS_MIN_LINES = 40
+# The letterhead (vendor name, address) is always kept
+_FOCUS_HEADER_LINES = 5
+# Lines of context kept before the first and after the last matching line
+_FOCUS_CONTEXT_LINES = 2
+
+def focus_invoice_region(text: str) -> str:
+    """
+    Trim a long document down to the letterhead plus one contiguous block running from the first
+    to the last line that looks like invoice content. Everything in between is kept, so line
+    items that don't match on their own (like rows with plain integer amounts) are never dropped.
+
+    Args:
+        text: The full text of the document
+
+    Returns:
+        The trimmed text, or the original text if it is short or nothing looks like an invoice
+    """
+    lines = text.splitlines()
+    if len(lines) <= _FOCUS_MIN_LINES:
+        return text
+
+    matches = [i for i, line in enumerate(lines) if _INVOICE_LINE_PATTERN.search(line)]
+
+    # If nothing looks like an invoice, let the LLM see everything rather than guess
+    if not matches:
+        return text
+
+    start = max(0, matches[0] - _FOCUS_CONTEXT_LINES)
+    end = min(len(lines), matches[-1] + _FOCUS_CONTEXT_LINES + 1)
+    return "\n".join(lines[:min(_FOCUS_HEADER_LINES, start)] + lines[start:end])
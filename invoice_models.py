@@ -0,0 +1,74 @@
+"""
+The invoice data model. INVOICE_SCHEMA is what the LLM is shown and what structured output
+decoding is constrained to; the msgspec Structs are what actually validate its responses.
+"""
+
+import datetime
+
+import msgspec
+
+# Define a fixed schema for invoice data
+INVOICE_SCHEMA = {
+    "type": "object",
+    "required": ["invoice_number", "date", "amount"],  # These fields must be present
+    "properties": {
+        "invoice_number": {"type": "string"},
+        "date": {"type": "string", "format": "date"},
+        "amount": {
+            "type": "object",
+            "properties": {
+                "value": {"type": "number"},
+                "currency": {"type": "string"}
+            },
+            "required": ["value", "currency"]
+        },
+        "vendor": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "tax_id": {"type": "string"},
+                "address": {"type": "string"}
+            },
+            "required": ["name"]
+        },
+        "line_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "quantity": {"type": "number"},
+                    "unit_price": {"type": "number"},
+                    "total": {"type": "number"}
+                },
+                "required": ["description", "total"]
+            }
+        }
+    }
+}
+
+# Typed mirror of the schema above. msgspec parses and validates the LLM output in a
+# single native pass, so there is no per-call schema walk. Optional fields use UNSET rather
+# than None so that, like the schema, they may be left out but never be null.
+# test_invoice_models.py checks that the two stay in agreement.
+class Amount(msgspec.Struct):
+    value: float
+    currency: str
+
+class Vendor(msgspec.Struct, omit_defaults=True):
+    name: str
+    tax_id: str | msgspec.UnsetType = msgspec.UNSET
+    address: str | msgspec.UnsetType = msgspec.UNSET
+
+class LineItem(msgspec.Struct, omit_defaults=True):
+    description: str
+    total: float
+    quantity: float | msgspec.UnsetType = msgspec.UNSET
+    unit_price: float | msgspec.UnsetType = msgspec.UNSET
+
+class Invoice(msgspec.Struct, omit_defaults=True):
+    invoice_number: str
+    date: datetime.date
+    amount: Amount
+    vendor: Vendor | msgspec.UnsetType = msgspec.UNSET
+    line_items: list[LineItem] = []
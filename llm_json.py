@@ -0,0 +1,37 @@
+"""
+Helpers for pulling JSON out of raw LLM responses. Models often wrap their JSON in a markdown
+code fence or surround it with commentary, especially when the backend ignores structured
+output settings.
+"""
+
+import re2
+
+# A ```json (or bare ```) fenced block, and the outermost {...} object for responses with prose
+# around them. RE2 compiles these to automata, so each search is a single linear pass with no
+# backtracking.
+_JSON_FENCE_PATTERN = re2.compile(r"(?s)```(?:json)?[ \t]*\n(.*?)```")
+_JSON_OBJECT_PATTERN = re2.compile(r"(?s)\{.*\}")
+
+def extract_json_block(text: str) -> str:
+    """
+    Strip markdown code fences and any surrounding prose from an LLM response, leaving just the JSON.
+
+    A response that already starts with an object or array is returned as-is, so top-level arrays
+    survive. Otherwise a fenced block wins over braces elsewhere in the text.
+
+    Args:
+        text: The raw LLM response
+
+    Returns:
+        The JSON text, ready to be parsed
+    """
+    stripped = text.strip()
+    if stripped.startswith(("{", "[")):
+        return stripped
+    match = _JSON_FENCE_PATTERN.search(text)
+    if match is not None:
+        return match.group(1).strip()
+    match = _JSON_OBJECT_PATTERN.search(text)
+    if match is not None:
+        return match.group(0).strip()
+    return stripped
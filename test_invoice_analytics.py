@@ -0,0 +1,41 @@
+import numpy as np
+
+from invoice_analytics import to_arrays
+
+
+def test_columns_follow_line_item_order():
+    invoice = {"line_items": [
+        {"description": "Widget", "quantity": 2, "unit_price": 10.0, "total": 20.0},
+        {"description": "Gadget", "quantity": 1, "unit_price": 5.5, "total": 5.5},
+    ]}
+
+    arrays = to_arrays(invoice)
+
+    np.testing.assert_array_equal(arrays["quantity"], [2.0, 1.0])
+    np.testing.assert_array_equal(arrays["unit_price"], [10.0, 5.5])
+    np.testing.assert_array_equal(arrays["total"], [20.0, 5.5])
+    assert arrays["total"].dtype == np.float64
+
+
+def test_missing_and_null_values_become_nan():
+    invoice = {"line_items": [
+        {"description": "Setup fee", "total": 100.0},
+        {"description": "Hours", "quantity": None, "unit_price": 150, "total": 6000},
+    ]}
+
+    arrays = to_arrays(invoice)
+
+    assert np.isnan(arrays["quantity"]).all()
+    assert np.isnan(arrays["unit_price"][0])
+    assert arrays["unit_price"][1] == 150.0
+    assert np.nansum(arrays["total"]) == 6100.0
+
+
+def test_empty_line_items_give_empty_arrays():
+    for invoice in ({"line_items": []}, {"invoice_number": "INV-1"}):
+        arrays = to_arrays(invoice)
+
+        assert set(arrays) == {"quantity", "unit_price", "total"}
+        for column in arrays.values():
+            assert column.shape == (0,)
+            assert column.dtype == np.float64
@@ -0,0 +1,56 @@
+from invoice_focus import focus_invoice_region
+
+
+def _invoice_with_integer_amounts():
+    header = ["Acme Consulting LLC", "12 Harbor Road", "Springfield", "555-0100", ""]
+    cover_letter = ["Thank you for choosing us for this engagement."] * 15
+    bill_to = ["Bill to:", "Globex Corporation", "Attn: Accounts Payable", "400 Main Street"]
+    invoice_header = ["Invoice 2024-117", "Description   Hours   Rate   Amount"]
+    rows = [f"Engineering work week {n}   40   150   6000" for n in range(1, 31)]
+    footer = ["Total   180000"]
+    terms = ["Lorem ipsum dolor sit amet, consectetur adipiscing elit."] * 40
+    return header, cover_letter, bill_to, rows, "\n".join(
+        header + cover_letter + bill_to + invoice_header + rows + footer + terms
+    )
+
+
+def test_keeps_every_line_item_with_integer_amounts():
+    _, _, _, rows, text = _invoice_with_integer_amounts()
+
+    focused = focus_invoice_region(text)
+
+    for row in rows:
+        assert row in focused
+    assert "Total   180000" in focused
+
+
+def test_keeps_letterhead_and_bill_to_block():
+    header, _, bill_to, _, text = _invoice_with_integer_amounts()
+
+    focused = focus_invoice_region(text)
+
+    for line in header[:4] + bill_to:
+        assert line in focused
+
+
+def test_trims_text_before_and_after_the_invoice():
+    _, _, _, _, text = _invoice_with_integer_amounts()
+
+    focused = focus_invoice_region(text)
+
+    # Only the context lines on either side of the invoice block survive
+    assert focused.count("Thank you for choosing us") <= 2
+    assert focused.count("Lorem ipsum") <= 2
+    assert len(focused.splitlines()) < len(text.splitlines())
+
+
+def test_short_documents_are_unchanged():
+    text = "Acme\nInvoice 7\nWidget   2   10   20\nTotal   20"
+
+    assert focus_invoice_region(text) == text
+
+
+def test_documents_without_invoice_content_are_unchanged():
+    text = "\n".join(["Lorem ipsum dolor sit amet."] * 60)
+
+    assert focus_invoice_region(text) == text
@@ -0,0 +1,60 @@
+import msgspec
+import pytest
+
+from invoice_models import INVOICE_SCHEMA, Invoice
+
+
+def _inline_refs(schema, defs):
+    """Resolve $refs and drop the annotations msgspec adds, leaving only the validation keywords."""
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    if "$ref" in schema:
+        return _inline_refs(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    resolved = {
+        key: _inline_refs(value, defs)
+        for key, value in schema.items()
+        if key not in ("title", "default")
+    }
+    if "required" in resolved:
+        resolved["required"] = sorted(resolved["required"])
+    return resolved
+
+
+def test_struct_matches_the_schema_shown_to_the_llm():
+    (invoice_ref,), defs = msgspec.json.schema_components([Invoice])
+
+    assert _inline_refs(invoice_ref, defs) == _inline_refs(INVOICE_SCHEMA, {})
+
+
+def _invoice(**overrides):
+    invoice = {
+        "invoice_number": "INV-1",
+        "date": "2024-01-15",
+        "amount": {"value": 20, "currency": "USD"},
+        "line_items": [{"description": "Widget", "total": 20}],
+    }
+    invoice.update(overrides)
+    return invoice
+
+
+def test_optional_fields_may_be_omitted():
+    decoded = msgspec.to_builtins(msgspec.convert(_invoice(), type=Invoice))
+
+    assert decoded == {
+        "invoice_number": "INV-1",
+        "date": "2024-01-15",
+        "amount": {"value": 20.0, "currency": "USD"},
+        "line_items": [{"description": "Widget", "total": 20.0}],
+    }
+
+
+@pytest.mark.parametrize("overrides", [
+    {"vendor": None},
+    {"line_items": [{"description": "Widget", "total": 20, "quantity": None}]},
+    {"date": "01/15/2024"},
+])
+def test_rejects_what_the_schema_rejects(overrides):
+    with pytest.raises(msgspec.ValidationError):
+        msgspec.convert(_invoice(**overrides), type=Invoice)
@@ -0,0 +1,33 @@
+from llm_json import extract_json_block
+
+
+def test_bare_object_is_unchanged():
+    assert extract_json_block('{"a": 1}') == '{"a": 1}'
+
+
+def test_top_level_array_is_unchanged():
+    assert extract_json_block(' [{"a":1},{"a":2}]\n') == '[{"a":1},{"a":2}]'
+
+
+def test_strips_json_fence():
+    assert extract_json_block('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+
+def test_strips_bare_fence_around_array():
+    assert extract_json_block('Here you go:\n```\n[1, 2]\n```') == '[1, 2]'
+
+
+def test_fence_wins_over_earlier_braces():
+    assert extract_json_block('Note {x}.\n```json\n{"a":1}\n```') == '{"a":1}'
+
+
+def test_empty_fence_gives_empty_string():
+    assert extract_json_block('Result:\n```json\n\n```') == ''
+
+
+def test_finds_object_inside_prose():
+    assert extract_json_block('Sure! {"a": {"b": 2}} Hope that helps.') == '{"a": {"b": 2}}'
+
+
+def test_text_without_json_is_returned_stripped():
+    assert extract_json_block('  no json here \n') == 'no json here'